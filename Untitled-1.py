@@ -7,19 +7,24 @@ Usage:
 """
 
 import sys
+import numpy as np
+
+from inp_parse import NODE_ROW, parse_block, last_rows
 
 def parse_inp(inp_file):
     """
     Parse a simple Abaqus .inp file containing nodes/elements/nsets/elsets.
     
     Returns:
-        nodes       (dict): { node_id: (x, y, z) }
+        node_ids    (ndarray): int64[N]      node ids, in file order, unique
+        node_xyz    (ndarray): float64[N, 3] node coordinates
         elements    (dict): { elem_id: [node1, node2, ..., node8] }
         nsets       (dict): { set_name: [node_ids...] }
         elsets      (dict): { set_name: [elem_ids...] }
         surfaces    (dict): { surf_name: [...] }  # placeholder, not processed here
     """
-    nodes = {}
+    node_blocks = []
+    node_lines = []
     elements = {}
     nsets = {}
     elsets = {}
@@ -39,6 +44,11 @@ def parse_inp(inp_file):
 
             # Check for keyword line
             if line_stripped.startswith('*'):
+                # Flush the node section that just ended
+                if reading_nodes:
+                    node_blocks.append(parse_block(node_lines, 4, NODE_ROW))
+                node_lines = []
+
                 # Reset reading flags
                 reading_nodes = False
                 reading_elements = False
@@ -107,14 +117,9 @@ def parse_inp(inp_file):
             # -----------------------------
             # If reading node lines
             # -----------------------------
+            # Collected as-is, parsed in one go when the section ends.
             if reading_nodes:
-                parts = line_stripped.split(',')
-                if len(parts) >= 4:
-                    nid = int(parts[0])
-                    x = float(parts[1])
-                    y = float(parts[2])
-                    z = float(parts[3])
-                    nodes[nid] = (x, y, z)
+                node_lines.append(line.encode('ascii'))
 
             # -----------------------------
             # If reading element lines
@@ -144,7 +149,23 @@ def parse_inp(inp_file):
                 ids = [int(x) for x in line_stripped.replace(',', ' ').split()]
                 elsets[current_elset_name].extend(ids)
 
-    return nodes, elements, nsets, elsets, surfaces
+    # File may end while still inside a node section
+    if reading_nodes:
+        node_blocks.append(parse_block(node_lines, 4, NODE_ROW))
+
+    node_blocks = [b for b in node_blocks if b is not None]
+    if node_blocks:
+        node_arr = np.concatenate(node_blocks)
+    else:
+        node_arr = np.empty(0, dtype=NODE_ROW)
+    node_ids = node_arr['id']
+    node_xyz = node_arr['xyz']
+    # A repeated node id keeps its last coordinates, as the old dict did
+    keep = last_rows(node_ids)
+    if keep is not None:
+        node_ids, node_xyz = node_ids[keep], node_xyz[keep]
+
+    return node_ids, node_xyz, elements, nsets, elsets, surfaces
 
 
 
@@ -159,10 +180,10 @@ def main():
     k_file   = sys.argv[2]
 
     # Parse the Abaqus inp file
-    nodes, elements, nsets, elsets, surfaces = parse_inp(inp_file)
+    node_ids, node_xyz, elements, nsets, elsets, surfaces = parse_inp(inp_file)
 
     # Write the LS-DYNA DUALCESE-style k file
-    write_k(k_file, nodes, elements, nsets, elsets, surfaces)
+    write_k(k_file, node_ids, node_xyz, elements, nsets, elsets, surfaces)
 
     print(f"Conversion complete. Output written to: {k_file}")
 
@@ -0,0 +1,80 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Optional C tokenizer for the *Node data lines of an Abaqus .inp file.
+
+Build it in place with:
+    cythonize -i _inp_fast.pyx
+
+main_Convert uses it when the built module can be imported and falls back to
+numpy (np.loadtxt) otherwise.
+"""
+
+from libc.stdint cimport int64_t
+from libc.stdlib cimport strtod, strtoll
+
+
+cdef inline const char* skip_blanks(const char* p, const char* end):
+    while p < end and (p[0] == b' ' or p[0] == b'\t'):
+        p += 1
+    return p
+
+
+cdef inline bint at_line_end(const char* p, const char* end):
+    return p >= end or p[0] == b'\n' or p[0] == b'\r'
+
+
+def parse_nodes(bytes buf, int64_t[::1] ids, double[:, ::1] xyz):
+    """
+    Parse "ID, X, Y, Z" lines from `buf` straight into `ids` / `xyz`.
+
+    Blank lines are skipped and extra columns on a line are ignored.
+    Returns the number of nodes read; raises ValueError on a line it can't
+    parse or if the output arrays are too short.
+
+    `buf` is a bytes object, so strtoll/strtod always stop at its trailing
+    NUL and never read past `end`.
+    """
+    cdef const char* p = buf
+    cdef const char* end = p + len(buf)
+    cdef char* endp
+    cdef Py_ssize_t row = 0
+    cdef int k
+
+    while p < end:
+        # skip blank lines / leading blanks
+        while p < end and (p[0] == b' ' or p[0] == b'\t' or p[0] == b'\r' or p[0] == b'\n'):
+            p += 1
+        if p >= end:
+            break
+        if row >= ids.shape[0] or row >= xyz.shape[0]:
+            raise ValueError("more node lines than rows in the output arrays")
+
+        ids[row] = strtoll(p, &endp, 10)
+        if endp == p:
+            raise ValueError("bad node id at byte %d" % (p - <const char*>buf))
+        p = endp
+
+        for k in range(3):
+            p = skip_blanks(p, end)
+            if p >= end or p[0] != b',':
+                raise ValueError("expected ',' at byte %d" % (p - <const char*>buf))
+            p = skip_blanks(p + 1, end)
+            # strtod would skip a line break and read the next line's value
+            if at_line_end(p, end):
+                raise ValueError("missing coordinate at byte %d" % (p - <const char*>buf))
+            xyz[row, k] = strtod(p, &endp)
+            if endp == p:
+                raise ValueError("bad coordinate at byte %d" % (p - <const char*>buf))
+            p = endp
+
+        # the field must end here, like np.loadtxt requires ("4 x" is an error)
+        p = skip_blanks(p, end)
+        if not (at_line_end(p, end) or p[0] == b','):
+            raise ValueError("bad coordinate at byte %d" % (p - <const char*>buf))
+
+        # rest of the line (extra columns) is ignored
+        while p < end and p[0] != b'\n':
+            p += 1
+        row += 1
+
+    return row
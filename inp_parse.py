@@ -0,0 +1,65 @@
+"""
+Row parsers shared by main_Convert.py and Untitled-1.py.
+
+Only needs numpy, so importing it does not pull in the rest of main_Convert.
+"""
+
+import io
+import numpy as np
+
+
+# One *Node data row: the id stays an integer ("1.7" is an error, not node 1)
+NODE_ROW = np.dtype([('id', np.int64), ('xyz', np.float64, (3,))])
+
+
+def parse_block(chunks, ncols, dtype):
+    """
+    Parse the data lines of one *Node / *Element section.
+
+    `chunks` are the raw bytes of the section (split wherever a comment line
+    sat in between). Same per-row rule as the old line-by-line parse: empty
+    trailing fields (a trailing ',') are dropped, rows with fewer than `ncols`
+    values are skipped and extra columns are cut off.
+    Returns an (N, ncols) array, or an (N,) record array for a structured
+    `dtype` such as NODE_ROW, or None if the section has no usable rows.
+    """
+    data = b''.join(chunks)
+    if not data.strip():
+        return None
+    try:
+        # Common case, every row has at least `ncols` values: one C-level pass
+        return load_rows(data, ncols, dtype)
+    except ValueError:
+        pass
+
+    # Short rows somewhere in the section: pick the usable rows first
+    rows = []
+    for line in data.splitlines():
+        fields = line.split(b',')
+        while fields and not fields[-1].strip():
+            fields.pop()
+        if len(fields) >= ncols:
+            rows.append(b','.join(fields[:ncols]))
+    if not rows:
+        return None
+    return load_rows(b'\n'.join(rows), ncols, dtype)
+
+
+def load_rows(data, ncols, dtype):
+    """np.loadtxt of the first `ncols` comma separated columns of `data`."""
+    dtype = np.dtype(dtype)
+    return np.loadtxt(io.BytesIO(data), delimiter=',', dtype=dtype,
+                      usecols=range(ncols), ndmin=1 if dtype.names else 2)
+
+
+def last_rows(ids):
+    """
+    Rows to keep so every id appears once, the last occurrence winning (as
+    the old {id: value} dicts did), in file order. None if ids are all unique.
+    """
+    if np.all(np.diff(ids) > 0):
+        return None  # strictly increasing, the usual case: no repeats
+    _, first_in_reversed = np.unique(ids[::-1], return_index=True)
+    if len(first_in_reversed) == len(ids):
+        return None
+    return np.sort(len(ids) - 1 - first_in_reversed)
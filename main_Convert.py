@@ -7,177 +7,358 @@ Usage:
     python inp_to_lsdyna.py mesh_euler.inp output.k
 """
 
+import array
+import contextlib
+import mmap
+import os
+import re
 import sys
-import pandas as pd
+import threading
 import numpy as np
-import pdb
 import config
+from inp_parse import NODE_ROW, parse_block, last_rows
+
+try:
+    # optional Cython build of the *Node tokenizer (cythonize -i _inp_fast.pyx)
+    from _inp_fast import parse_nodes
+except ImportError:
+    parse_nodes = None
+
+# Section currently being read by parse_inp (set on each '*' keyword line)
+MODE_SKIP = 0
+MODE_NODE = 1
+MODE_ELEM = 2
+MODE_NSET = 3
+MODE_ELSET = 4
+MODE_SURF = 5
+
+# Local (0 based) node indices of each hex face, row i = face "S{i+1}"
+FACE_IDX = np.array([config.abq_surf_def[f"S{i+1}"] for i in range(6)],
+                    dtype=np.int64) - 1
+# Face id -> row of FACE_IDX ("S3" -> 2); only S1..S6 are valid
+FACE_ROW = {f"S{i+1}": i for i in range(6)}
+
+# Row formats of the .k data blocks (np.savetxt, one C-level % per row)
+NODE_FMT = "%d, %g, %g, %g, 0, 0"                   # nid, x, y, z
+ELEM_FMT = ", ".join(["%d"] * 10)                   # eid, pid, n1..n8
+SEGMENT_FMT = "%d, %d, %d, %d,0.0,0.0,0.0,0.0"      # n1..n4 of a face
+# Node rows as records, so the id column is written from int64, not a float
+NODE_REC = np.dtype([('nid', np.int64), ('x', np.float64), ('y', np.float64), ('z', np.float64)])
+
+# A line whose first non-blank character is '*' (keyword or '**' comment)
+KEYWORD_LINE_RE = re.compile(rb'^[ \t]*\*[^\n]*', re.M)
+
+# Keyword name of such a line ("*Node", "*Solid Section"; not "**" comments)
+KEYWORD_RE = re.compile(rb'[ \t]*\*(\w+(?:[ \t]+\w+)*)')
+# "key=value" options following the keyword
+PARAM_RE = re.compile(rb'(\w+)[ \t]*=[ \t]*([^\s,]+)')
+
+
+def scan_keyword_lines(buf):
+    """
+    Byte scanner behind find_keyword_lines (compiled with numba when available).
+
+    Walks `buf` (uint8 array) once, line by line, and returns the (start, end)
+    offsets of every line whose first non-blank byte is '*' as a (K, 2) array.
+    """
+    n = buf.shape[0]
+    # keyword lines are rare: start small, double on overflow
+    spans = np.empty((64, 2), dtype=np.int64)
+    count = 0
+    pos = 0
+    while pos < n:
+        # skip leading blanks (' ', '\t')
+        first = pos
+        while first < n and (buf[first] == 32 or buf[first] == 9):
+            first += 1
+        # find the end of the line ('\n')
+        end = first
+        while end < n and buf[end] != 10:
+            end += 1
+        if first < n and buf[first] == 42:  # '*'
+            if count == spans.shape[0]:
+                grown = np.empty((2 * count, 2), dtype=np.int64)
+                grown[:count] = spans
+                spans = grown
+            spans[count, 0] = pos
+            spans[count, 1] = end
+            count += 1
+        pos = end + 1
+    return spans[:count]
+
+
+# numba build of scan_keyword_lines: None = not tried yet, False = no numba
+_compiled_scanner = None
+
+
+def compiled_scanner():
+    """
+    scan_keyword_lines compiled with numba, or None when numba isn't installed.
+
+    numba is imported and the scanner compiled on first use only, so importing
+    this module stays cheap. The signatures are given explicitly so compiling
+    happens here, before any mmap buffer is passed in: compiling lazily on
+    the first call keeps that buffer referenced until the next gc run, and
+    then parse_inp can't close the mapping.
+    """
+    global _compiled_scanner
+    if _compiled_scanner is None:
+        try:
+            from numba import njit, types
+        except ImportError:
+            # numba is optional; find_keyword_lines falls back to a regex scan
+            _compiled_scanner = False
+        else:
+            _compiled_scanner = njit(
+                [types.int64[:, :](types.Array(types.uint8, 1, 'C', readonly=True)),
+                 types.int64[:, :](types.Array(types.uint8, 1, 'C'))],
+                cache=True)(scan_keyword_lines)
+    return _compiled_scanner or None
+
+
+def find_keyword_lines(buf):
+    """
+    Locate the keyword/comment lines of an .inp file held in memory.
+
+    Everything between two of these lines is data for the earlier keyword, so
+    only these (few) lines need to be looked at in Python.
+    Returns a (K, 2) int64 array of (start, end) byte offsets, end exclusive.
+    """
+    scanner = compiled_scanner()
+    if scanner is not None:
+        return scanner(np.frombuffer(buf, dtype=np.uint8))
+    spans = [m.span() for m in KEYWORD_LINE_RE.finditer(buf)]
+    return np.array(spans, dtype=np.int64).reshape(-1, 2)
+
+
+def parse_node_block(chunks):
+    """
+    Parse the data lines of one *Node section.
+
+    Uses the Cython tokenizer (_inp_fast.parse_nodes) when it is built and
+    parse_block / np.loadtxt otherwise, or when the tokenizer rejects the data.
+    Returns (ids int64[N], xyz float64[N, 3]), or None if there are no usable rows.
+    """
+    if parse_nodes is not None:
+        data = b''.join(chunks)
+        rows = data.count(b'\n') + 1
+        ids = np.empty(rows, dtype=np.int64)
+        xyz = np.empty((rows, 3), dtype=np.float64)
+        try:
+            n = parse_nodes(data, ids, xyz)
+        except ValueError:
+            pass  # unusual layout, let np.loadtxt deal with it below
+        else:
+            return (ids[:n], xyz[:n]) if n else None
+    arr = parse_block(chunks, 4, NODE_ROW)
+    if arr is None:
+        return None
+    return arr['id'], np.ascontiguousarray(arr['xyz'])
+
+
+def stack_blocks(blocks, ncols, dtype):
+    """Concatenate the parsed sections of one kind into a single (N, ncols) array."""
+    blocks = [b for b in blocks if b is not None]
+    if not blocks:
+        return np.empty((0, ncols), dtype=dtype)
+    return np.vstack(blocks)
+
+
+def parse_id_list(chunk):
+    """
+    Parse a run of raw *Nset / *Elset data lines in a single pass.
+    Returns the ids in file order (int64 array); write_k sorts and dedups them.
+    """
+    # ids may be split by ',' and/or whitespace, incl. a trailing ',' per line
+    text = chunk.replace(b',', b' ')
+    if not text.strip():
+        return np.empty(0, dtype=np.int64)
+    return np.fromstring(text, sep=' ', dtype=np.int64)
+
 
 def parse_inp(inp_file):
     """
     Parse a simple Abaqus .inp file containing nodes/elements/nsets/elsets.
     
     Returns:
-        nodes       (dict): { node_id: (x, y, z) }
-        elements    (dict): { elem_id: [node1, node2, ..., node8], 'type': 'C3D8R' }
-        nsets       (dict): { set_name: [node_ids...] }
-        elsets      (dict): { set_name: [elem_ids...] }
+        node_ids    (ndarray): int64[N]      node ids, in file order, unique
+        node_xyz    (ndarray): float64[N, 3] node coordinates
+        elem_ids    (ndarray): int64[M]      element ids, in file order, unique
+        elem_conn   (ndarray): int64[M, 8]   hex connectivity (node ids)
+        nsets       (dict): { set_name: int64 array of node ids }
+        elsets      (dict): { set_name: int64 array of elem ids }
         surfaces    (dict): { surf_name: [ [elm id, "SX"]] }   # 
     """
-    nodes = {}
-    elements = {}
+    node_blocks = []
+    elem_blocks = []
+    section_chunks = []
     nsets = {}
     elsets = {}
     surfaces = {}
 
-    reading_nodes = False
-    reading_elements = False
-    current_elset_name = None
-    current_nset_name = None
-    current_surf_name = None
-
-    # In Abaqus .inp, lines that start with '*' are keywords;
-    # lines that follow (until the next '*') are data lines for that keyword.
-    with open(inp_file, 'r') as f:
-        for line in f:
-            line_stripped = line.strip()
-            # Skip blank lines or comments (if any)
-            if not line_stripped or line_stripped.startswith('**'):
+    # What the data lines under the current keyword belong to
+    mode = MODE_SKIP
+    current_name = None
+
+    def add_data(chunk):
+        """Hand the raw data bytes between two keyword lines to the current section."""
+        # Node / element lines are collected as-is and parsed in one go
+        # (parse_block) when the section ends.
+        # Node line:    ID, X, Y, Z
+        # Element line: ID, n1, n2, n3, n4, n5, n6, n7, n8  (hex, C3D8)
+        if mode == MODE_NODE or mode == MODE_ELEM:
+            section_chunks.append(chunk)
+
+        # Node sets in .inp can be comma separated or continued lines
+        # e.g. " 1, 2, 3, 4," across multiple lines.
+        # Parsed right away and appended to the set's packed int64 buffer.
+        elif mode == MODE_NSET:
+            nsets[current_name].frombytes(parse_id_list(chunk).view(np.uint8))
+
+        # Element sets, same layout as node sets
+        elif mode == MODE_ELSET:
+            elsets[current_name].frombytes(parse_id_list(chunk).view(np.uint8))
+
+        # Surface definitions: elm id, face id ("S1".."S6")
+        elif mode == MODE_SURF:
+            for line in chunk.decode('ascii').splitlines():
+                line_stripped = line.strip()
+                if line_stripped:
+                    [id, surf] = line_stripped.split(',')
+                    surfaces[current_name].append([int(id), surf])
+
+    # Map the file rather than reading it in: keyword lines are found on the
+    # mapping and only the data slices handed to the parsers get copied out.
+    with open(inp_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            mapping = contextlib.nullcontext(b'')  # mmap can't map an empty file
+        else:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    with mapping as buf:
+        # In Abaqus .inp, lines that start with '*' are keywords;
+        # lines that follow (until the next '*') are data lines for that keyword.
+        # Only the keyword lines are visited here, data is passed on in bulk.
+        data_start = 0
+        for kw_start, kw_end in find_keyword_lines(buf).tolist():
+            add_data(buf[data_start:kw_start])
+            data_start = kw_end
+
+            # Keyword and its "param=value" options in one regex pass each,
+            # e.g. "*Nset, nset=K1A" -> keyword 'nset', params {'nset': 'K1A'}.
+            # Comments ('**') don't match, the current section carries on after them.
+            m = KEYWORD_RE.match(buf, kw_start, kw_end)
+            if m is None:
                 continue
+            keyword = m.group(1).decode('ascii').lower()
+            params = {key.decode('ascii').lower(): value.decode('ascii')
+                      for key, value in PARAM_RE.findall(buf, m.end(), kw_end)}
+
+            # Flush the node/element section that just ended
+            if mode == MODE_NODE:
+                node_blocks.append(parse_node_block(section_chunks))
+            elif mode == MODE_ELEM:
+                elem_blocks.append(parse_block(section_chunks, 9, np.int64))
+            section_chunks = []
+
+            mode = MODE_SKIP
+            current_name = None
+
+            # 1) *Node
+            if keyword == 'node':
+                mode = MODE_NODE
+
+            # 2) *Element, e.g. *Element, type=C3D8R
+            elif keyword == 'element':
+                mode = MODE_ELEM
+                # You could use the element type if needed, e.g. if you have different types
+                # For demonstration we'll just keep 'C3D8R' or 'UNKNOWN'
+                elem_type_str = params.get('type', 'UNKNOWN').lower()
+                # We might store different element arrays per type,
+                # but for demonstration we'll keep them all in `elem_conn`.
+
+            # 3) *Nset, e.g. *Nset, nset=MYNODESET
+            elif keyword == 'nset':
+                current_name = params.get('nset', '').upper()
+                if current_name:
+                    mode = MODE_NSET
+                    nsets.setdefault(current_name, array.array('q'))
+
+            # 4) *Elset, e.g. *Elset, elset=EULER_ELEMS
+            elif keyword == 'elset':
+                current_name = params.get('elset', '').upper()
+                if current_name:
+                    mode = MODE_ELSET
+                    elsets.setdefault(current_name, array.array('q'))
+
+            # 5) *Surface, e.g. *Surface, name=SOMESURF, type=ELEMENT
+            elif keyword == 'surface':
+                # Surfaces can be more complex. We'll do a placeholder:
+                current_name = params.get('name', '').upper()
+                if current_name:
+                    mode = MODE_SURF
+                    surfaces.setdefault(current_name, [])
+                # you might need to store more info (type=ELEMENT, etc.)
+                # We'll skip details for brevity.
+
+        # Data after the last keyword line
+        add_data(buf[data_start:])
+
+    # Flush the section the file ended in
+    if mode == MODE_NODE:
+        node_blocks.append(parse_node_block(section_chunks))
+    elif mode == MODE_ELEM:
+        elem_blocks.append(parse_block(section_chunks, 9, np.int64))
+
+    node_blocks = [b for b in node_blocks if b is not None]
+    if node_blocks:
+        node_ids = np.concatenate([ids for ids, _ in node_blocks])
+        node_xyz = np.concatenate([xyz for _, xyz in node_blocks])
+    else:
+        node_ids = np.empty(0, dtype=np.int64)
+        node_xyz = np.empty((0, 3), dtype=np.float64)
+
+    elem_arr = stack_blocks(elem_blocks, 9, np.int64)
+    elem_ids = np.ascontiguousarray(elem_arr[:, 0])
+    elem_conn = np.ascontiguousarray(elem_arr[:, 1:9])
+
+    # Repeated node/element ids: the last definition wins
+    keep = last_rows(node_ids)
+    if keep is not None:
+        node_ids, node_xyz = node_ids[keep], node_xyz[keep]
+    keep = last_rows(elem_ids)
+    if keep is not None:
+        elem_ids, elem_conn = elem_ids[keep], elem_conn[keep]
+
+    # int64 views on the packed buffers, no copy
+    nsets = {name: np.frombuffer(ids, dtype=np.int64) for name, ids in nsets.items()}
+    elsets = {name: np.frombuffer(ids, dtype=np.int64) for name, ids in elsets.items()}
+
+    return node_ids, node_xyz, elem_ids, elem_conn, nsets, elsets, surfaces
+
+def id_order(ids):
+    """
+    Row order that sorts `ids` (stable). Abaqus writes ids in increasing
+    order almost always, in which case the sort is skipped.
+    """
+    if np.all(np.diff(ids) > 0):
+        return np.arange(len(ids))
+    return np.argsort(ids, kind='stable')
+
+
+def write_id_lines(f, ids, chunk_size):
+    """
+    Write an int array as comma separated lines of `chunk_size` ids each
+    (the last line holds whatever is left over). `f` is opened in binary mode.
+    """
+    k, r = divmod(len(ids), chunk_size)
+    np.savetxt(f, ids[:k*chunk_size].reshape(k, chunk_size),
+               fmt=", ".join(["%d"] * chunk_size))
+    if r:
+        f.write((", ".join(map(str, ids[k*chunk_size:])) + "\n").encode('ascii'))
 
-            # Check for keyword lines
-            if line_stripped.startswith('*'):
-                reading_nodes = False
-                reading_elements = False
-
-                # Lowercase for safer checks
-                lower_line = line_stripped.lower()
-
-                # 1) *Node
-                if lower_line.startswith('*node'):
-                    reading_nodes = True
-
-                # 2) *Element, e.g. *Element, type=C3D8R
-                elif lower_line.startswith('*element'):
-                    reading_elements = True
-                    # You could parse the element type if needed, e.g.:
-                    #   element_type = ...
-                    #   Actually parse from "type=C3D8R" in the line if you have different types
-                    # For demonstration we'll just store 'C3D8R' or 'UNKNOWN'
-                    # or you can store it in a variable to reuse
-                    if 'type=' in lower_line:
-                        eq_idx = lower_line.index('type=')
-                        elem_type_str = lower_line[eq_idx+5:].replace(',', '').replace(' ', '')
-                    else:
-                        elem_type_str = 'UNKNOWN'
-                    # We might store different element arrays per type,
-                    # but for demonstration we'll keep them all in `elements`.
-
-                # 3) *Nset
-                elif lower_line.startswith('*nset'):
-                    # parse name from the line, e.g. *Nset, nset=SETNAME
-                    # example: "*Nset, nset=MYNODESET"
-                    name = None
-                    if 'nset=' in lower_line:
-                        start = lower_line.index('nset=') + len('nset=')
-                        # read until comma or end
-                        rest = lower_line[start:].split(',')[0]
-                        name = rest.strip().upper()
-                    if name:
-                        current_nset_name = name
-                        nsets.setdefault(name, [])
-                        current_elset_name = None
-                        current_surf_name = None
-                    else:
-                        current_nset_name = None
-
-                # 4) *Elset
-                elif lower_line.startswith('*elset'):
-                    # parse name from the line, e.g. *Elset, elset=EULER_ELEMS
-                    name = None
-                    if 'elset=' in lower_line:
-                        start = lower_line.index('elset=') + len('elset=')
-                        rest = lower_line[start:].split(',')[0]
-                        name = rest.strip().upper()
-                    if name:
-                        current_elset_name = name
-                        elsets.setdefault(name, [])
-                        current_nset_name = None
-                        current_surf_name = None
-                    else:
-                        current_elset_name = None
-
-                # 5) *Surface
-                elif lower_line.startswith('*surface'):
-                    # parse name, e.g. *Surface, name=SOMESURF, type=ELEMENT
-                    # Surfaces can be more complex. We'll do a placeholder:
-                    name = None
-                    if 'name=' in lower_line:
-                        start = lower_line.index('name=') + len('name=')
-                        rest = lower_line[start:].split(',')[0]
-                        name = rest.strip().upper()
-                    if name:
-                        current_surf_name = name
-                        surfaces.setdefault(name, [])
-                        current_elset_name = None
-                        current_nset_name = None
-                    else:
-                        name = None
-                    # you might need to store more info (type=ELEMENT, etc.)
-                    # We'll skip details for brevity.
-                continue
 
-            # If we are reading node lines
-            if reading_nodes:
-                # Node line typically:  ID, X, Y, Z
-                # e.g. "      1, 0.0, 0.0, 0.0"
-                parts = line_stripped.split(',')
-                if len(parts) >= 4:
-                    nid = int(parts[0])
-                    x = float(parts[1])
-                    y = float(parts[2])
-                    z = float(parts[3])
-                    nodes[nid] = (x, y, z)
-
-            # If we are reading element lines
-            elif reading_elements:
-                # For a hex (C3D8) in Abaqus: ID, n1, n2, n3, n4, n5, n6, n7, n8
-                parts = line_stripped.split(',')
-                # Typically 9 entries: [elem_id, node1, node2, ..., node8]
-                if len(parts) >= 9:
-                    eid = int(parts[0])
-                    conn = [int(p) for p in parts[1:9]]
-                    elements[eid] = conn
-
-            # If we have a current_nset_name, lines may contain node IDs (space- or comma-separated)
-            if current_nset_name is not None and line_stripped and not line_stripped.startswith('*'):
-                # Node sets in .inp can be comma separated or continued lines
-                # e.g. " 1, 2, 3, 4," across multiple lines
-                
-                #ids = [int(x) for x in line_stripped.replace(',', ' ').split()]
-
-                ids = []
-                for x in line_stripped.replace(',', ' ').split():
-                    if x:
-                        #print(x)
-                        ids.append(int(x))
-
-                nsets[current_nset_name].extend(ids)
-
-            # If we have a current_elset_name, lines may contain element IDs
-            if current_elset_name is not None and line_stripped and not line_stripped.startswith('*'):
-                ids = [int(x) for x in line_stripped.replace(',', ' ').split()]
-                elsets[current_elset_name].extend(ids)
-
-            # if we have a surface name, lines may contain surface defintions
-            if current_surf_name is not None and line_stripped and not line_stripped.startswith('*'):
-                [id, surf] = line_stripped.split(',')
-                surfaces[current_surf_name].append([int(id), surf])
-                tmp=0
-
-    return nodes, elements, nsets, elsets, surfaces
-
-def write_k(k_file, nodes, elements, nsets, elsets, surfaces):
+def write_k(k_file, node_ids, node_xyz, elem_ids, elem_conn, nsets, elsets, surfaces):
     """
     Write a minimal LS-DYNA DUALCESE-style .k file:
       *KEYWORD
@@ -191,95 +372,180 @@ def write_k(k_file, nodes, elements, nsets, elsets, surfaces):
 
     Adjust spacing/format as needed to match your 'fluid_mesh1.k' example.
     """
-    with open(k_file, 'w') as f:
+    # Binary mode with a large buffer: the output is plain ASCII, so skip the
+    # text layer (encoding, newline translation); blocks are written whole.
+    with open(k_file, 'wb', buffering=1 << 20) as f:
         # Header
-        #f.write("*KEYWORD\n")
+        #f.write(b"*KEYWORD\n")
 
         # --- NODE block ---
-        f.write("*DUALCESE_NODE3D\n")
+        f.write(b"*DUALCESE_NODE3D\n")
         # LSDYNA free format example: ID, X, Y, Z
         #  (some users prefer fixed columns, e.g. 8 columns wide)
-        for nid in sorted(nodes.keys()):
-            x, y, z = nodes[nid]
-            # Adjust format if your example uses different spacing
-            f.write("{:d}, {:g}, {:g}, {:g}, {:g}, {:g}\n".format(nid, x, y, z,0,0))
+        # Adjust format if your example uses different spacing
+        order = id_order(node_ids)
+        out = np.empty(len(order), dtype=NODE_REC)
+        out['nid'] = node_ids[order]
+        out['x'], out['y'], out['z'] = node_xyz[order].T
+        np.savetxt(f, out, fmt=NODE_FMT)
 
         # --- ELEMENT_SOLID block ---
         # LSDYNA format: EID, PID, n1, n2, ..., n8
         # For a single-part fluid domain, we can just pick PID=1
         pid = 1
-        f.write("*DUALCESE_ELE3D\n")
-        for eid in sorted(elements.keys()):
-            conn = elements[eid]
-            # Typically 8 nodes for a hex
-            # If you have other types, handle them as needed
-            if len(conn) == 8:
-                f.write(f"{eid}, {pid}")
-                for nn in conn:
-                    f.write(", {:d}".format(nn))
-                f.write("\n")
-            else:
-                # If you need to handle different topologies, do so here
-                pass
+        f.write(b"*DUALCESE_ELE3D\n")
+        # Only 8-node hexes are kept by parse_inp
+        # If you have other types, handle them as needed
+        elem_order = id_order(elem_ids)
+        out = np.column_stack([elem_ids[elem_order],
+                               np.full(len(elem_order), pid, dtype=np.int64),
+                               elem_conn[elem_order]])
+        np.savetxt(f, out, fmt=ELEM_FMT)
 
         # --- Node sets ---
         for set_name, node_list in nsets.items():
-            f.write("$ Node set: {}\n".format(set_name))
+            f.write("$ Node set: {}\n".format(set_name).encode('ascii'))
             
-            f.write("*DUALCESE_NODESET\n")
+            f.write(b"*DUALCESE_NODESET\n")
             curid = config.nodeset_ssid[set_name]
-            f.write(f"       {curid}\n")
+            f.write(f"       {curid}\n".encode('ascii'))
             
             # chunk them in lines of (for example) 8 per line
-            sorted_nodeset = sorted(set(node_list))  # remove dupes, sort
-            chunk_size = 8
-            for i in range(0, len(sorted_nodeset), chunk_size):
-                chunk = sorted_nodeset[i:i+chunk_size]
-                f.write(", ".join(str(n) for n in chunk) + "\n")
+            sorted_nodeset = np.unique(np.asarray(node_list, dtype=np.int64))  # remove dupes, sort
+            write_id_lines(f, sorted_nodeset, 8)
+
+
+        # element ids in sorted order, to map an element id to its row in elem_conn
+        sorted_elem_ids = elem_ids[elem_order]
+
+        def get_surface_nodes(elmids, faceids):
+            """Node ids of every (element, face) pair at once -> (K, 4) array."""
+            if len(sorted_elem_ids) == 0:
+                raise KeyError(int(elmids[0]))
+            pos = np.searchsorted(sorted_elem_ids, elmids)
+            pos = np.minimum(pos, len(sorted_elem_ids) - 1)
+            missing = sorted_elem_ids[pos] != elmids
+            if missing.any():
+                raise KeyError(int(elmids[missing][0]))
+            rows = elem_order[pos]
+            # Only the distinct face ids (a handful) go through FACE_ROW
+            names, first, inverse = np.unique(np.char.strip(faceids),
+                                              return_index=True, return_inverse=True)
+            name_rows = np.empty(len(names), dtype=np.int64)
+            for k, name in enumerate(names):
+                if name not in FACE_ROW:
+                    raise KeyError(faceids[first[k]])
+                name_rows[k] = FACE_ROW[name]
+            face_rows = name_rows[inverse.ravel()]
+            return elem_conn[rows[:, None], FACE_IDX[face_rows]]
 
 
-        def get_surface_nodes(elements, elmid, faceid):
-            curelm = elements[elmid]
-            curnodes = config.abq_surf_def[faceid]      
-            curnodes = [i-1 for i in curnodes] # 1 based to 0 based indexing
-            return [curelm[i] for i in curnodes]
-        
-
         #---- Surface sets ---
         for set_name, surf_list in surfaces.items():
-            f.write("$ Surface set: {}\n".format(set_name))
+            f.write("$ Surface set: {}\n".format(set_name).encode('ascii'))
             
-            f.write("*DUALCESE_SEGMENTSET\n")
+            f.write(b"*DUALCESE_SEGMENTSET\n")
             curid = config.segmentset_ssid[set_name]
-            f.write(f"       {curid}\n")
+            f.write(f"       {curid}\n".encode('ascii'))
             
-            for surf in surf_list:
-                elmid = surf[0]
-                faceid = surf[1]
-                curnodes = get_surface_nodes(elements, elmid, faceid)
-                f.write(f"{curnodes[0]}, {curnodes[1]}, {curnodes[2]}, {curnodes[3]},0.0,0.0,0.0,0.0\n")            
+            if not surf_list:
+                continue
+            elmids = np.array([surf[0] for surf in surf_list], dtype=np.int64)
+            faceids = [surf[1] for surf in surf_list]
+            curnodes = get_surface_nodes(elmids, faceids)
+            np.savetxt(f, curnodes, fmt=SEGMENT_FMT)
 
         # --- Element sets ---
         # If your example uses e.g. '*SET_ELEMENT_LIST_TITLE', adapt accordingly
         for set_name, elem_list in elsets.items():
-            f.write("$ Element set: {}\n".format(set_name))
+            f.write("$ Element set: {}\n".format(set_name).encode('ascii'))
             
             
-            f.write("*DUALCESE_ELEMENTSET\n")
+            f.write(b"*DUALCESE_ELEMENTSET\n")
             curid = config.elementset_ssid[set_name]
-            f.write(f"      {curid}\n")
+            f.write(f"      {curid}\n".encode('ascii'))
 
-            sorted_elemset = sorted(set(elem_list))
-            chunk_size = 8
-            for i in range(0, len(sorted_elemset), chunk_size):
-                chunk = sorted_elemset[i:i+chunk_size]
-                f.write(", ".join(str(e) for e in chunk) + "\n")
+            sorted_elemset = np.unique(np.asarray(elem_list, dtype=np.int64))
+            write_id_lines(f, sorted_elemset, 8)
 
         # If needed: surface definitions -> *SET_SEGMENT, etc.
         #  We'll skip for brevity.
 
         # Footer
-        f.write("*END\n")
+        f.write(b"*END\n")
+
+
+def convert_one(inp_file, k_file):
+    """Convert a single .inp file to a .k file."""
+    # 1) Parse .inp
+    node_ids, node_xyz, elem_ids, elem_conn, nsets, elsets, surfaces = parse_inp(inp_file)
+
+    # 2) Write LSDYNA .k
+    write_k(k_file, node_ids, node_xyz, elem_ids, elem_conn, nsets, elsets, surfaces)
+
+
+def prefetch_files(paths, slots=None, stop=None, chunk_size=1 << 20):
+    """
+    Read each file once, in order, so it already sits in the OS page cache
+    when a worker maps it in parse_inp. The data itself is thrown away.
+
+    If given, one `slots` semaphore count is taken before each file (the
+    caller releases it when that file is done), and `stop` ends the loop early.
+    """
+    # one reusable buffer, nothing is allocated per chunk
+    buf = bytearray(chunk_size)
+    for path in paths:
+        if slots is not None:
+            slots.acquire()
+        if stop is not None and stop.is_set():
+            return
+        try:
+            with open(path, 'rb') as f:
+                while f.readinto(buf):
+                    pass
+        except OSError:
+            pass  # the worker converting this file reports the error
+
+
+def convert_many(pairs, processes=None, lookahead=2):
+    """
+    Convert many meshes in parallel.
+
+    pairs: iterable of (inp_file, k_file). Each pair is converted by
+    convert_one in a worker process, while a reader thread reads the input
+    files from disk ahead of the workers: at most `lookahead` files beyond
+    the ones being converted, so earlier files stay in the page cache.
+    """
+    from multiprocessing import Pool  # only needed here, keeps imports light
+
+    pairs = list(pairs)
+    if not pairs:
+        return
+    # no point starting more workers than there are files
+    processes = min(len(pairs), processes or os.cpu_count() or 1)
+    # Workers are forked before the reader thread exists (forking a
+    # multi-threaded process can deadlock)
+    with Pool(processes) as pool:
+        slots = threading.Semaphore(processes + lookahead)
+        stop = threading.Event()
+        reader = threading.Thread(target=prefetch_files,
+                                  args=([inp_file for inp_file, _ in pairs], slots, stop),
+                                  name="convert_many-prefetch", daemon=True)
+        reader.start()
+
+        def done(_):
+            slots.release()
+
+        try:
+            results = [pool.apply_async(convert_one, pair, callback=done, error_callback=done)
+                       for pair in pairs]
+            for result in results:
+                result.get()
+        finally:
+            # unblock the reader if it is still waiting for a slot
+            stop.set()
+            slots.release()
+            reader.join()
 
 
 def main():
@@ -287,11 +553,7 @@ def main():
     #     print("Usage: python inp_to_lsdyna.py <mesh_euler.inp> <output.k>")
     #     sys.exit(1)
 
-    # 1) Parse .inp
-    nodes, elements, nsets, elsets, surfaces = parse_inp(config.inp_file)
-
-    # 2) Write LSDYNA .k
-    write_k(config.k_file, nodes, elements, nsets, elsets, surfaces)
+    convert_one(config.inp_file, config.k_file)
 
     print("Conversion complete. Output written to", config.k_file)
 
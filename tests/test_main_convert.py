@@ -0,0 +1,230 @@
+import importlib.util
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO))
+
+import main_Convert  # noqa: E402
+
+
+def write_inp(tmp_path, text):
+    path = tmp_path / "mesh.inp"
+    path.write_bytes(text.encode('ascii'))
+    return str(path)
+
+
+def test_parse_block_trailing_comma():
+    arr = main_Convert.parse_block([b"1, 0.0, 0.0, 0.0,\n2, 1.0, 2.0, 3.0,\n"], 4, np.float64)
+    np.testing.assert_array_equal(arr, [[1, 0, 0, 0], [2, 1, 2, 3]])
+
+
+def test_parse_block_ragged_rows():
+    # short rows are skipped, wide rows cut to ncols
+    arr = main_Convert.parse_block([b"1,0,0,0,7,7\n2,1,1\n3,1,2,3,\n4,1,2,\n"], 4, np.float64)
+    np.testing.assert_array_equal(arr, [[1, 0, 0, 0], [3, 1, 2, 3]])
+
+
+def test_parse_block_element_continuation_line():
+    data = b"1,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,\n17,18,19,20\n2,1,2,3,4,5,6,7,8\n"
+    arr = main_Convert.parse_block([data], 9, np.int64)
+    np.testing.assert_array_equal(arr, [[1, 1, 2, 3, 4, 5, 6, 7, 8],
+                                        [2, 1, 2, 3, 4, 5, 6, 7, 8]])
+
+
+def test_parse_inp_trailing_comma_nodes(tmp_path):
+    inp = write_inp(tmp_path, "*Node\n1, 0.0, 0.0, 0.0,\n2, 1.5, 0.0, 0.0,\n"
+                              "*Element, type=C3D8R\n1, 1,2,3,4,5,6,7,8,\n")
+    node_ids, node_xyz, elem_ids, elem_conn = main_Convert.parse_inp(inp)[:4]
+    np.testing.assert_array_equal(node_ids, [1, 2])
+    np.testing.assert_array_equal(node_xyz, [[0, 0, 0], [1.5, 0, 0]])
+    np.testing.assert_array_equal(elem_ids, [1])
+    np.testing.assert_array_equal(elem_conn, [[1, 2, 3, 4, 5, 6, 7, 8]])
+
+
+def test_parse_inp_repeated_ids_last_wins(tmp_path):
+    inp = write_inp(tmp_path, "*Node\n1,0,0,0\n2,1,1,1\n1,5,5,5\n"
+                              "*Element, type=C3D8R\n"
+                              "7,1,2,3,4,5,6,7,8\n7,8,7,6,5,4,3,2,1\n")
+    node_ids, node_xyz, elem_ids, elem_conn = main_Convert.parse_inp(inp)[:4]
+    np.testing.assert_array_equal(node_ids, [2, 1])
+    np.testing.assert_array_equal(node_xyz, [[1, 1, 1], [5, 5, 5]])
+    np.testing.assert_array_equal(elem_ids, [7])
+    np.testing.assert_array_equal(elem_conn, [[8, 7, 6, 5, 4, 3, 2, 1]])
+
+
+def write_k_args(tmp_path, text):
+    return (str(tmp_path / "out.k"),) + main_Convert.parse_inp(write_inp(tmp_path, text))
+
+
+def test_write_k_surface_without_elements(tmp_path):
+    args = write_k_args(tmp_path, "*Node\n1,0,0,0\n*Surface, name=outers\n1, S1\n")
+    with pytest.raises(KeyError):
+        main_Convert.write_k(*args)
+
+
+@pytest.mark.parametrize("faceid", ["S0", "S7", "SPOS", "SNEG"])
+def test_write_k_rejects_unknown_face(tmp_path, faceid):
+    args = write_k_args(tmp_path, "*Node\n1,0,0,0\n*Element, type=C3D8R\n1,1,2,3,4,5,6,7,8\n"
+                                  "*Surface, name=outers\n1, %s\n" % faceid)
+    with pytest.raises(KeyError, match=faceid):
+        main_Convert.write_k(*args)
+
+
+def test_write_k_surface_face_nodes(tmp_path):
+    args = write_k_args(tmp_path, "*Node\n1,0,0,0\n*Element, type=C3D8R\n1,11,12,13,14,15,16,17,18\n"
+                                  "*Surface, name=outers\n1, S2\n1, S6\n1,  S2 \n")
+    main_Convert.write_k(*args)
+    out = Path(args[0]).read_text()
+    assert ("15, 18, 17, 16,0.0,0.0,0.0,0.0\n14, 18, 15, 11,0.0,0.0,0.0,0.0\n"
+            "15, 18, 17, 16,0.0,0.0,0.0,0.0\n") in out
+
+
+def test_find_keyword_lines_matches_regex_scan():
+    # more keyword lines than the scanner's initial capacity
+    buf = b"".join(b"*Nset, nset=S%d\n  ** note\n1, 2,\n" % i for i in range(100)) + b"*End"
+    expected = [m.span() for m in main_Convert.KEYWORD_LINE_RE.finditer(buf)]
+    spans = main_Convert.find_keyword_lines(buf)
+    assert spans.tolist() == [list(span) for span in expected]
+    assert main_Convert.find_keyword_lines(b"").shape == (0, 2)
+
+
+def test_convert_many(tmp_path):
+    inp = write_inp(tmp_path, "*Node\n1,0,0,0\n2,1,0,0\n*Element, type=C3D8R\n1,1,2,1,2,1,2,1,2\n")
+    pairs = [(inp, str(tmp_path / ("out%d.k" % i))) for i in range(4)]
+    main_Convert.convert_many(pairs, processes=2, lookahead=1)
+    expected = Path(pairs[0][1]).read_text()
+    assert "*DUALCESE_ELE3D\n1, 1, 1, 2, 1, 2, 1, 2, 1, 2\n" in expected
+    for _, k_file in pairs[1:]:
+        assert Path(k_file).read_text() == expected
+
+
+
+def test_convert_many_missing_input(tmp_path):
+    inp = write_inp(tmp_path, "*Node\n1,0,0,0\n")
+    pairs = [(inp, str(tmp_path / "a.k")), (str(tmp_path / "missing.inp"), str(tmp_path / "b.k")),
+             (inp, str(tmp_path / "c.k"))]
+    with pytest.raises(FileNotFoundError):
+        main_Convert.convert_many(pairs, processes=2, lookahead=0)
+    # the reader thread was stopped and joined, not left behind
+    assert not any(t.name == "convert_many-prefetch" for t in threading.enumerate())
+
+
+def test_convert_many_no_pairs():
+    main_Convert.convert_many([])
+
+
+NODE_SECTIONS = [
+    b"1, 0.0, 0.0, 0.0\n2, 1.5, -2e3, .5\n",
+    b"1, 0.0, 0.0, 0.0,\n2, 1.5, 0.0, 0.0,\n",       # trailing comma
+    b"\n  1 , 0 , 0 , 0 \r\n\r\n2,1,1,1,9,9\n",      # blanks, CRLF, extra columns
+    b"1,0,0,0\n2,1,1\n3,1,2,3,\n4,1,2,\n",           # short rows are skipped
+    b"1,2\n",                                         # nothing usable
+    b"",
+]
+
+
+@pytest.mark.parametrize("data", NODE_SECTIONS)
+def test_parse_node_block_tokenizer_matches_fallback(monkeypatch, data):
+    fast = pytest.importorskip("_inp_fast")
+    monkeypatch.setattr(main_Convert, "parse_nodes", fast.parse_nodes)
+    with_fast = main_Convert.parse_node_block([data])
+    monkeypatch.setattr(main_Convert, "parse_nodes", None)
+    fallback = main_Convert.parse_node_block([data])
+    if fallback is None:
+        assert with_fast is None
+    else:
+        np.testing.assert_array_equal(with_fast[0], fallback[0])
+        np.testing.assert_array_equal(with_fast[1], fallback[1])
+
+
+@pytest.mark.parametrize("data", [b"1,0,0,0 x\n", b"1,0,0,abc\n",
+                                  b"1.,0,0,0\n", b"1.7,0,0,0\n"])  # ids must be integers
+def test_parse_node_block_bad_number_raises(monkeypatch, data):
+    # same error whether or not the tokenizer is built
+    monkeypatch.setattr(main_Convert, "parse_nodes", None)
+    with pytest.raises(ValueError):
+        main_Convert.parse_node_block([data])
+    try:
+        import _inp_fast
+    except ImportError:
+        return
+    monkeypatch.setattr(main_Convert, "parse_nodes", _inp_fast.parse_nodes)
+    with pytest.raises(ValueError):
+        main_Convert.parse_node_block([data])
+
+
+def test_write_k_node_ids_stay_integers(tmp_path):
+    # 2**53 + 1 does not survive a round trip through float64
+    args = write_k_args(tmp_path, "*Node\n9007199254740993, 0.5, 0, 0\n")
+    main_Convert.write_k(*args)
+    assert "\n9007199254740993, 0.5, 0, 0, 0, 0\n" in Path(args[0]).read_text()
+
+
+def test_convert_matches_reference_output(tmp_path):
+    # input_files/mesh_euler_converted.k is the known-good output for mesh_euler.inp
+    k_file = tmp_path / "mesh_euler_converted.k"
+    parsed = main_Convert.parse_inp(str(REPO / "input_files" / "mesh_euler.inp"))
+    main_Convert.write_k(str(k_file), *parsed)
+    assert k_file.read_bytes() == (REPO / "input_files" / "mesh_euler_converted.k").read_bytes()
+
+
+def test_parse_id_list():
+    ids = main_Convert.parse_id_list(b"\n 5, 3, 9,\r\n1,2 ,\n\n7\n")
+    assert ids.dtype == np.int64
+    np.testing.assert_array_equal(ids, [5, 3, 9, 1, 2, 7])
+    assert main_Convert.parse_id_list(b" \n").shape == (0,)
+
+
+@pytest.mark.parametrize("n, expected", [
+    (0, ""),
+    (3, "1, 2, 3\n"),
+    (8, "1, 2, 3, 4, 5, 6, 7, 8\n"),
+    (11, "1, 2, 3, 4, 5, 6, 7, 8\n9, 10, 11\n"),
+])
+def test_write_id_lines(tmp_path, n, expected):
+    out = tmp_path / "ids.k"
+    with open(out, 'wb') as f:
+        main_Convert.write_id_lines(f, np.arange(1, n + 1, dtype=np.int64), 8)
+    assert out.read_text() == expected
+
+
+def test_write_k_sets_sorted_and_deduplicated(tmp_path):
+    args = write_k_args(tmp_path, "*Node\n1,0,0,0\n*Element, type=C3D8R\n1,1,2,3,4,5,6,7,8\n"
+                                  "*Nset, nset=k1a\n12, 3, 5, 3,\n11, 10, 9, 8, 7,\n** note\n6, 5, 4,\n"
+                                  "*Elset, elset=fluid1\n2, 1, 2,\n*Nset, nset=K1A\n1\n")
+    np.testing.assert_array_equal(args[5]["K1A"], [12, 3, 5, 3, 11, 10, 9, 8, 7, 6, 5, 4, 1])
+    main_Convert.write_k(*args)
+    out = Path(args[0]).read_text()
+    assert ("$ Node set: K1A\n*DUALCESE_NODESET\n       999\n"
+            "1, 3, 4, 5, 6, 7, 8, 9\n10, 11, 12\n") in out
+    assert "$ Element set: FLUID1\n*DUALCESE_ELEMENTSET\n      2222\n1, 2\n" in out
+
+
+def load_untitled():
+    spec = importlib.util.spec_from_file_location("untitled_1", REPO / "Untitled-1.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_untitled_parse_keeps_last_node(tmp_path):
+    inp = write_inp(tmp_path, "*Node\n1,0,0,0\n2,1,1,1\n*Node\n1,5,5,5\n")
+    node_ids, node_xyz = load_untitled().parse_inp(str(inp))[:2]
+    np.testing.assert_array_equal(node_ids, [2, 1])
+    np.testing.assert_array_equal(node_xyz, [[1, 1, 1], [5, 5, 5]])
+
+
+def test_untitled_does_not_import_converter():
+    code = ("import importlib.util, sys\n"
+            "spec = importlib.util.spec_from_file_location('u', 'Untitled-1.py')\n"
+            "spec.loader.exec_module(importlib.util.module_from_spec(spec))\n"
+            "print(sorted({'main_Convert', 'numba', 'multiprocessing'} & set(sys.modules)))\n")
+    out = subprocess.run([sys.executable, "-c", code], cwd=REPO, check=True,
+                         capture_output=True, text=True).stdout
+    assert out.strip() == "[]"